@@ -1,10 +1,36 @@
+import logging
 import os
+import pathlib
 import sqlite3
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Callable, Sequence
+
+import migrations
+import project_snapshot
+from models import Project, project_row_factory
 
 
 DB_FILENAME = 'projects.db'
 
+logger = logging.getLogger(__name__)
+
+# Optional read-only copy of the database (see backup.refresh_replica) that
+# listing queries read from to offload the primary. Writes do not touch it:
+# BackupScheduler refreshes it in the background once the data generation has
+# moved, so listings may lag a write by up to its replica_interval.
+_read_replica_path: Optional[str] = None
+
+# Optional memory-mapped snapshot of the live rows (see project_snapshot).
+# When set, every write republishes it and list_projects reads from it.
+_snapshot_path: Optional[str] = None
+
+# Callables run after every successful write made through this module.
+_write_hooks: List[Callable[[], None]] = []
+
+_LIST_SQL = (
+    "SELECT id, title, description, image_file_name, created_at FROM projects "
+    "WHERE deleted_at IS NULL ORDER BY created_at DESC, id DESC"
+)
+
 
 def get_db_path() -> str:
     return os.path.join(os.path.dirname(__file__), DB_FILENAME)
@@ -16,28 +42,110 @@ def get_connection() -> sqlite3.Connection:
     return conn
 
 
-def init_db() -> None:
-    """Create database and projects table if not exists."""
-    with get_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT NOT NULL,
-                image_file_name TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
+def set_read_replica(path: Optional[str]) -> None:
+    """Route listing queries to the replica at `path`, or back to the primary if None."""
+    global _read_replica_path
+    _read_replica_path = path
+
+
+def get_read_connection() -> sqlite3.Connection:
+    """Read-only connection to the replica when one is configured and present."""
+    if _read_replica_path and os.path.exists(_read_replica_path):
+        uri = pathlib.Path(_read_replica_path).absolute().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+    return get_connection()
+
+
+def set_snapshot_path(path: Optional[str]) -> None:
+    """Serve list_projects from a snapshot at `path` republished on every write, or stop if None."""
+    global _snapshot_path
+    _snapshot_path = path
+
+
+def publish_snapshot() -> None:
+    """Write the current live rows to the configured snapshot file."""
+    if not _snapshot_path:
+        return
+    conn = get_connection()
+    try:
+        # Holding the write lock while publishing keeps concurrent writers
+        # from replacing a newer snapshot with an older one.
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(_LIST_SQL).fetchall()
+        project_snapshot.write_snapshot(_snapshot_path, rows, generation=_read_generation(conn))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _read_generation(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT value FROM dal_meta WHERE key = 'generation'").fetchone()[0]
 
 
-def list_projects() -> List[sqlite3.Row]:
+def get_generation() -> int:
+    """Counter bumped by every change to live project rows, from any writer."""
     with get_connection() as conn:
-        cur = conn.execute(
-            "SELECT id, title, description, image_file_name, created_at FROM projects ORDER BY created_at DESC"
-        )
-        return cur.fetchall()
+        return _read_generation(conn)
+
+
+def add_write_hook(hook: Callable[[], None]) -> None:
+    """Call `hook()` after every insert or delete made through the DAL; adding twice is a no-op."""
+    if hook not in _write_hooks:
+        _write_hooks.append(hook)
+
+
+def remove_write_hook(hook: Callable[[], None]) -> None:
+    if hook in _write_hooks:
+        _write_hooks.remove(hook)
+
+
+def _note_write() -> None:
+    # The write has already committed: a failed publish or hook is logged and
+    # leaves that copy stale rather than failing the write.
+    for task in [publish_snapshot] + list(_write_hooks):
+        try:
+            task()
+        except Exception:
+            logger.exception("Post-write task %s failed", getattr(task, '__name__', task))
+
+
+def init_db() -> None:
+    """Create the database if needed and apply pending schema migrations."""
+    conn = get_connection()
+    try:
+        # auto_vacuum only takes effect before the first table is created (see
+        # enable_incremental_vacuum for older files); WAL lets readers carry on
+        # while the compactor or a writer holds the lock.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        migrations.migrate(conn)
+    finally:
+        conn.close()
+
+
+def list_projects() -> Sequence[Project]:
+    """Live projects, newest first.
+
+    In snapshot mode this is the mapped ProjectSnapshot itself; rows are decoded
+    from the shared mapping only as they are indexed or iterated.
+    """
+    if _snapshot_path:
+        snapshot = project_snapshot.load_snapshot(_snapshot_path)
+        if snapshot is None:
+            # Missing or unreadable (e.g. truncated by a full disk): replace it.
+            try:
+                publish_snapshot()
+                snapshot = project_snapshot.load_snapshot(_snapshot_path)
+            except OSError:
+                logger.exception("Could not publish projects snapshot; reading the database")
+        if snapshot is not None:
+            return snapshot
+    with get_read_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = project_row_factory
+        return cur.execute(_LIST_SQL).fetchall()
 
 
 def insert_project(title: str, description: str, image_file_name: str) -> int:
@@ -46,12 +154,72 @@ def insert_project(title: str, description: str, image_file_name: str) -> int:
             "INSERT INTO projects (title, description, image_file_name) VALUES (?, ?, ?)",
             (title.strip(), description.strip(), image_file_name.strip()),
         )
-        return cur.lastrowid
+    _note_write()
+    return cur.lastrowid
 
 
 def delete_project(project_id: int) -> int:
+    """Soft-delete a project by stamping its tombstone; returns rows affected."""
+    return delete_projects([project_id])
+
+
+def delete_projects(project_ids: Iterable[int]) -> int:
+    """Soft-delete many projects in a single transaction; returns rows affected."""
+    ids = [(int(pid),) for pid in project_ids]
+    if not ids:
+        return 0
     with get_connection() as conn:
-        cur = conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        # rowcount sums the executemany batch and, unlike total_changes,
+        # leaves out rows touched by triggers.
+        deleted = conn.executemany(
+            "UPDATE projects SET deleted_at = CURRENT_TIMESTAMP "
+            "WHERE id = ? AND deleted_at IS NULL",
+            ids,
+        ).rowcount
+    _note_write()
+    return deleted
+
+
+def purge_deleted_projects(older_than_seconds: float = 0) -> int:
+    """Permanently remove tombstoned rows deleted at least `older_than_seconds` ago."""
+    with get_connection() as conn:
+        cur = conn.execute(
+            "DELETE FROM projects WHERE deleted_at IS NOT NULL "
+            "AND deleted_at <= datetime('now', ?)",
+            (f'-{int(older_than_seconds)} seconds',),
+        )
         return cur.rowcount
 
 
+def enable_incremental_vacuum() -> bool:
+    """Convert a database created without incremental auto-vacuum; returns True if converted.
+
+    The pragma only applies to an existing database after a full VACUUM, which
+    rewrites the whole file under the write lock, so run this while the app is
+    quiet. The compactor does so on its first quiet pass.
+    """
+    conn = get_connection()
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+def compact_db(max_pages: int = 500) -> int:
+    """Reclaim up to `max_pages` free pages and refresh planner statistics.
+
+    Returns the number of free pages left afterwards. Databases created before
+    incremental auto-vacuum was enabled keep their free list until
+    enable_incremental_vacuum() converts them; only the statistics are
+    refreshed for those.
+    """
+    with get_connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            # executescript steps the pragma to completion; execute() frees one page.
+            conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+        conn.execute("PRAGMA optimize")
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
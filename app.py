@@ -1,42 +1,134 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, current_app
 import os
 from datetime import datetime
-from DAL import init_db, list_projects, insert_project, delete_project
+import DAL
+from DAL import init_db, list_projects, insert_project, delete_project, delete_projects
 
-app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this-in-production'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Configuration
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  
+# Configuration defaults; anything passed to create_app() overrides these.
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'your-secret-key-change-this-in-production',
+    'UPLOAD_FOLDER': os.path.join(BASE_DIR, 'uploads'),
+    'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,
+    'BACKUP_DIR': os.path.join(BASE_DIR, 'backups'),
+    'READ_REPLICA_PATH': None,
+    'PROJECTS_SNAPSHOT_PATH': None,
+    'EXPORT_DIR': os.path.join(BASE_DIR, 'export'),
+    'EXPORT_ON_WRITE': False,
+    'START_BACKGROUND_JOBS': False,
+}
 
+# Views are collected here at import time and bound to each app by create_app(),
+# so importing this module does not build an app or touch the filesystem.
+_routes = []
+_error_handlers = []
 
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-# Ensure DB exists at startup
-init_db()
 
-@app.route('/')
+def route(rule, **options):
+    def decorator(view):
+        _routes.append((rule, view, options))
+        return view
+    return decorator
+
+
+def errorhandler(code):
+    def decorator(handler):
+        _error_handlers.append((code, handler))
+        return handler
+    return decorator
+
+
+def create_app(config=None) -> Flask:
+    """Build the Flask app; the database is initialised on the first request."""
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    for rule, view, options in _routes:
+        app.add_url_rule(rule, view_func=view, **options)
+    for code, handler in _error_handlers:
+        app.register_error_handler(code, handler)
+
+    # DAL routing is process-wide; always apply it (None resets it) so an app
+    # never inherits a replica or snapshot configured for an earlier one.
+    DAL.set_read_replica(app.config['READ_REPLICA_PATH'])
+    DAL.set_snapshot_path(app.config['PROJECTS_SNAPSHOT_PATH'])
+
+    from export import export_command, enable_export_on_write, disable_export_on_write
+    app.cli.add_command(export_command)
+    # Process-wide like the DAL routing above: the latest app decides.
+    if app.config['EXPORT_ON_WRITE']:
+        enable_export_on_write(app)
+    else:
+        disable_export_on_write()
+
+    app.extensions['projects_db_ready'] = False
+    app.before_request(_ensure_db)
+    if app.config['START_BACKGROUND_JOBS']:
+        start_background_jobs(app)
+    return app
+
+
+def start_background_jobs(app: Flask) -> list:
+    """Start the compactor and backup threads for `app` once; returns the threads.
+
+    Call this from whichever process should own maintenance, e.g. a gunicorn
+    `post_worker_init` hook, or set START_BACKGROUND_JOBS in the config.
+    """
+    if 'background_jobs' not in app.extensions:
+        from compactor import Compactor
+        from backup import BackupScheduler
+        init_db()
+        jobs = [
+            Compactor(),
+            BackupScheduler(app.config['BACKUP_DIR'], replica_path=app.config['READ_REPLICA_PATH']),
+        ]
+        for job in jobs:
+            job.start()
+        app.extensions['background_jobs'] = jobs
+    return app.extensions['background_jobs']
+
+
+def _ensure_db():
+    if current_app.extensions['projects_db_ready']:
+        return
+    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+    init_db()
+    current_app.extensions['projects_db_ready'] = True
+
+
+def __getattr__(name):
+    # Keep `from app import app` working for tests and WSGI servers while
+    # deferring app construction until something actually asks for it.
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@route('/')
 def index():
     """Home page route"""
     return render_template('index.html')
 
-@app.route('/about')
+@route('/about')
 def about():
     """About page route"""
     return render_template('about.html')
 
-@app.route('/resume')
+@route('/resume')
 def resume():
     """Resume page route"""
     return render_template('resume.html')
 
-@app.route('/projects')
+@route('/projects')
 def projects():
     """Projects page route"""
     projects_rows = list_projects()
     return render_template('projects.html', projects=projects_rows)
 
-@app.route('/projects/add', methods=['GET', 'POST'])
+@route('/projects/add', methods=['GET', 'POST'])
 def add_project():
     if request.method == 'POST':
         title = request.form.get('title', '').strip()
@@ -62,7 +154,7 @@ def add_project():
 
     return render_template('project_form.html')
 
-@app.route('/projects/delete/<int:project_id>', methods=['POST'])
+@route('/projects/delete/<int:project_id>', methods=['POST'])
 def delete_project_route(project_id: int):
     deleted_count = delete_project(project_id)
     if deleted_count:
@@ -71,7 +163,17 @@ def delete_project_route(project_id: int):
         flash('Project not found', 'error')
     return redirect(url_for('projects'))
 
-@app.route('/contact', methods=['GET', 'POST'])
+@route('/projects/delete', methods=['POST'])
+def delete_projects_route():
+    project_ids = [pid for pid in request.form.getlist('project_ids') if pid.isdigit()]
+    if not project_ids:
+        flash('No projects selected', 'error')
+        return redirect(url_for('projects'))
+    deleted_count = delete_projects(int(pid) for pid in project_ids)
+    flash(f'{deleted_count} project(s) deleted', 'success')
+    return redirect(url_for('projects'))
+
+@route('/contact', methods=['GET', 'POST'])
 def contact():
     """Contact page route with form handling"""
     if request.method == 'POST':
@@ -130,7 +232,7 @@ def contact():
     
     return render_template('contact.html')
 
-@app.route('/thank-you')
+@route('/thank-you')
 def thank_you():
     """Thank you page route"""
     form_data = session.get('form_data')
@@ -140,18 +242,24 @@ def thank_you():
     
     return render_template('thankyou.html', form_data=form_data)
 
-@app.route('/download-resume')
+@route('/download-resume')
 def download_resume():
     """Route to serve resume PDF"""
     return send_file('Zein_George_Resume.pdf', as_attachment=True)
 
-@app.errorhandler(404)
+@errorhandler(404)
 def not_found(error):
     return render_template('404.html'), 404
 
-@app.errorhandler(500)
+@errorhandler(500)
 def internal_error(error):
     return render_template('500.html'), 500
 
 if __name__ == '__main__':
+    app = create_app()
+    # With debug=True the reloader runs this module twice: a watcher parent and
+    # the child that serves requests (WERKZEUG_RUN_MAIN set). Only the child
+    # owns the compactor and backup threads.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_jobs(app)
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Online backups of projects.db.
+
+Copies go through SQLite's backup API a few pages at a time, releasing the
+source lock between steps, so the app keeps serving reads and writes while a
+snapshot is taken. Each copy is written to a temporary file and renamed into
+place, so a reader never sees a half-written backup.
+
+Usage:
+    python backup.py [backup_dir] [--keep N] [--replica PATH]
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import DAL
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = 'projects-'
+SNAPSHOT_SUFFIX = '.db'
+
+
+def backup_database(dest_path: str, pages: int = 64, sleep: float = 0.005,
+                    source_path: Optional[str] = None) -> str:
+    """Copy the live database to `dest_path`, `pages` pages per step.
+
+    Sleeps `sleep` seconds between steps so writers can take the lock; SQLite
+    only uses its own `sleep` argument when a step finds the source busy.
+    """
+    def pace(status: int, remaining: int, total: int) -> None:
+        if remaining:
+            time.sleep(sleep)
+
+    # A unique temp name lets several workers refresh the same replica at once.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest_path)), prefix='.backup-')
+    os.close(fd)
+    try:
+        src = sqlite3.connect(source_path or DAL.get_db_path())
+        try:
+            dst = sqlite3.connect(tmp_path)
+            try:
+                src.backup(dst, pages=pages, progress=pace, sleep=sleep)
+                # Plain rollback-journal files can be opened read-only anywhere.
+                dst.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                dst.close()
+        finally:
+            src.close()
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return dest_path
+
+
+def list_snapshots(backup_dir: str) -> List[str]:
+    """Snapshot paths in `backup_dir`, oldest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = sorted(
+        name for name in os.listdir(backup_dir)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+    )
+    return [os.path.join(backup_dir, name) for name in names]
+
+
+def prune_snapshots(backup_dir: str, keep: int) -> List[str]:
+    """Delete all but the newest `keep` snapshots; returns the removed paths."""
+    if keep < 1:
+        raise ValueError(f"keep must be at least 1, got {keep}")
+    snapshots = list_snapshots(backup_dir)
+    removed = snapshots[:-keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def take_snapshot(backup_dir: str, keep: int = 7, **backup_kwargs) -> str:
+    """Write a timestamped snapshot into `backup_dir` and apply retention."""
+    if keep < 1:
+        raise ValueError(f"keep must be at least 1, got {keep}")
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    path = backup_database(
+        os.path.join(backup_dir, f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"), **backup_kwargs
+    )
+    prune_snapshots(backup_dir, keep)
+    return path
+
+
+def refresh_replica(replica_path: str, **backup_kwargs) -> str:
+    """Replace the read replica with a fresh copy of the primary."""
+    return backup_database(replica_path, **backup_kwargs)
+
+
+class BackupScheduler(threading.Thread):
+    """Background thread taking snapshots and refreshing the read replica.
+
+    Snapshots are taken every `interval` seconds. The replica, when set, is
+    refreshed at start and then checked every `replica_interval` seconds: it
+    is copied again only if the data generation counter (bumped by every
+    write, from any process) has moved. Listings read from the replica can
+    therefore lag a write by up to `replica_interval` plus the copy time,
+    while idle periods cost one small query per check.
+    """
+
+    def __init__(self, backup_dir: str, interval: float = 60 * 60, keep: int = 7,
+                 replica_path: Optional[str] = None, replica_interval: float = 5.0):
+        super().__init__(name='projects-backup', daemon=True)
+        self.backup_dir = backup_dir
+        self.interval = interval
+        self.keep = keep
+        self.replica_path = replica_path
+        self.replica_interval = replica_interval
+        self._stop_event = threading.Event()
+        self._replica_generation: Optional[int] = None
+
+    def refresh_replica_if_changed(self) -> bool:
+        """Copy the primary to the replica if it changed since the last copy; returns True if copied."""
+        # Read before copying: a write landing mid-copy triggers the next refresh.
+        generation = DAL.get_generation()
+        if generation == self._replica_generation and os.path.exists(self.replica_path):
+            return False
+        refresh_replica(self.replica_path)
+        self._replica_generation = generation
+        return True
+
+    def _refresh_replica(self) -> None:
+        try:
+            self.refresh_replica_if_changed()
+        except (sqlite3.Error, OSError):
+            logger.exception("Replica refresh failed")
+
+    def run(self) -> None:
+        if self.replica_path:
+            self._refresh_replica()
+        tick = min(self.interval, self.replica_interval) if self.replica_path else self.interval
+        since_snapshot = since_replica = 0.0
+        while not self._stop_event.wait(tick):
+            since_snapshot += tick
+            since_replica += tick
+            if self.replica_path and since_replica >= self.replica_interval:
+                self._refresh_replica()
+                since_replica = 0.0
+            if since_snapshot >= self.interval:
+                try:
+                    take_snapshot(self.backup_dir, self.keep)
+                except (sqlite3.Error, OSError):
+                    logger.exception("Backup failed")
+                since_snapshot = 0.0
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Take an online snapshot of projects.db")
+    parser.add_argument('backup_dir', nargs='?',
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups'))
+    parser.add_argument('--keep', type=_positive_int, default=7, help="number of snapshots to retain")
+    parser.add_argument('--replica', help="also refresh the read replica at this path")
+    args = parser.parse_args(argv)
+
+    print(f"Snapshot written to {take_snapshot(args.backup_dir, args.keep)}")
+    if args.replica:
+        print(f"Replica refreshed at {refresh_replica(args.replica)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark listing rows as sqlite3.Row versus the slotted models.Project.
+
+Fills a temporary database, then for each row type measures the memory held
+by the fetched list (via tracemalloc), the fetch time and the time to render
+templates/projects.html.
+
+Usage:
+    python bench_projects.py [--rows N]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Sequence
+from unittest.mock import patch
+
+import DAL
+from DAL import _LIST_SQL
+from models import project_row_factory
+
+
+def _fill(db_path: str, rows: int) -> None:
+    with patch('DAL.get_db_path', return_value=db_path):
+        DAL.init_db()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO projects (title, description, image_file_name) VALUES (?, ?, ?)",
+            ((f"Project {i}", f"Description of project number {i}", f"image{i}.jpg") for i in range(rows)),
+        )
+    conn.close()
+
+
+def _fetch(db_path: str, factory: Callable) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+        cur.row_factory = factory
+        return cur.execute(_LIST_SQL).fetchall()
+    finally:
+        conn.close()
+
+
+def _measure(db_path: str, factory: Callable, render: Callable[[list], str]) -> dict:
+    _fetch(db_path, factory)  # warm the page cache
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = _fetch(db_path, factory)
+    fetch_s = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    render(rows)
+    render_s = time.perf_counter() - start
+    return {'memory': held, 'fetch': fetch_s, 'render': render_s, 'count': len(rows)}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare sqlite3.Row and Project listing cost")
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    from flask import render_template
+    from app import create_app
+    app = create_app({'TESTING': True})
+
+    def render(rows: List) -> str:
+        with app.test_request_context('/projects'):
+            return render_template('projects.html', projects=rows)
+
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        _fill(db_path, args.rows)
+        results = {
+            'sqlite3.Row': _measure(db_path, sqlite3.Row, render),
+            'Project': _measure(db_path, project_row_factory, render),
+        }
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    per = 100_000 / args.rows
+    print(f"{args.rows} rows (memory scaled to 100k rows)")
+    print(f"{'row type':<12} {'MiB/100k':>10} {'fetch ms':>10} {'render ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['memory'] * per / 2**20:>10.1f} {r['fetch'] * 1000:>10.1f} {r['render'] * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import DAL
+
+logger = logging.getLogger(__name__)
+
+
+class Compactor(threading.Thread):
+    """Background thread that purges tombstones and compacts projects.db.
+
+    Work only runs once the data generation counter (bumped by triggers on
+    every write, from any process) has not moved for `quiet_seconds`. Each
+    pass reclaims at most `max_pages` pages so the write lock is held briefly.
+    The first quiet pass on a database created without incremental
+    auto-vacuum converts it with a one-off full VACUUM.
+    The database runs in WAL mode, so readers are never blocked by a pass.
+    """
+
+    def __init__(self, interval: float = 60.0, quiet_seconds: float = 30.0,
+                 tombstone_ttl: float = 24 * 60 * 60, max_pages: int = 500):
+        super().__init__(name='projects-compactor', daemon=True)
+        self.interval = interval
+        self.quiet_seconds = quiet_seconds
+        self.tombstone_ttl = tombstone_ttl
+        self.max_pages = max_pages
+        self._stop_event = threading.Event()
+        self._last_generation: Optional[int] = None
+        self._last_change_at = 0.0
+
+    def seconds_quiet(self) -> float:
+        """Seconds since this compactor last saw the generation counter move."""
+        generation = DAL.get_generation()
+        now = time.monotonic()
+        if generation != self._last_generation:
+            self._last_generation = generation
+            self._last_change_at = now
+        return now - self._last_change_at
+
+    def run_once(self) -> Optional[int]:
+        """Run one pass if the database is quiet; returns rows purged or None."""
+        if self.seconds_quiet() < self.quiet_seconds:
+            return None
+        purged = DAL.purge_deleted_projects(self.tombstone_ttl)
+        DAL.enable_incremental_vacuum()
+        DAL.compact_db(self.max_pages)
+        return purged
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except sqlite3.Error:  # e.g. database is locked; retry next pass
+                logger.exception("Compactor pass failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,276 @@
+"""
+Static export of the site for a plain file server.
+
+Every GET route without URL arguments that returns HTML is fetched through the
+test client and written as ``<path>/index.html`` with a gzip copy alongside
+(for nginx ``gzip_static`` and similar). Static assets are copied across. A
+manifest records the templates and database generation behind each page, so
+later runs only re-render pages whose templates or project data changed.
+
+Usage:
+    flask --app app export [OUT_DIR] [--force]
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import click
+from flask import Flask, current_app, template_rendered
+from flask.cli import with_appcontext
+from jinja2 import TemplateNotFound, meta
+
+import DAL
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent exports are not serialised
+    fcntl = None
+
+MANIFEST_NAME = '.export-manifest.json'
+LOCK_NAME = '.export.lock'
+
+# Endpoints whose output depends on the projects table.
+DB_ENDPOINTS = ('projects',)
+
+_COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.json', '.svg', '.txt')
+
+
+def _static_pages(app: Flask) -> List[Tuple[str, str]]:
+    """(url, endpoint) for every GET route that takes no arguments."""
+    pages = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static' or rule.arguments or 'GET' not in rule.methods:
+            continue
+        pages.append((rule.rule, rule.endpoint))
+    return sorted(pages)
+
+
+def _output_path(url: str) -> str:
+    path = url.strip('/')
+    return os.path.join(path, 'index.html') if path else 'index.html'
+
+
+def _template_hashes(app: Flask, names: Iterable[str]) -> Dict[str, str]:
+    """Hash each template and, recursively, everything it extends or includes."""
+    env = app.jinja_env
+    hashes: Dict[str, str] = {}
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in hashes:
+            continue
+        source = env.loader.get_source(env, name)[0]
+        hashes[name] = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        pending.extend(ref for ref in meta.find_referenced_templates(env.parse(source)) if ref)
+    return hashes
+
+
+def _templates_unchanged(app: Flask, recorded: Dict[str, str]) -> bool:
+    try:
+        return _template_hashes(app, recorded) == recorded
+    except TemplateNotFound:
+        return False
+
+
+def _write(out_dir: str, rel_path: str, data: bytes, compress: bool) -> None:
+    path = os.path.join(out_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _replace(path, data)
+    if compress:
+        # mtime=0 keeps the .gz byte-identical across runs.
+        _replace(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def _replace(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-export-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; the file server must read it
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _export_lock(out_dir: str):
+    """Serialise exports into `out_dir` across processes (manifest read-modify-write)."""
+    with open(os.path.join(out_dir, LOCK_NAME), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _remove_page(out_dir: str, manifest: dict, url: str) -> None:
+    """Delete a page's files and manifest entry so the file server stops serving it."""
+    entry = manifest['pages'].pop(url)
+    path = os.path.join(out_dir, entry['file'])
+    for stale in (path, path + '.gz'):
+        if os.path.exists(stale):
+            os.remove(stale)
+    directory = os.path.dirname(path)
+    if os.path.abspath(directory) != os.path.abspath(out_dir) and os.path.isdir(directory) \
+            and not os.listdir(directory):
+        os.rmdir(directory)
+    logger.info("Removed stale export of %s", url)
+
+
+def _copy_static(app: Flask, out_dir: str) -> None:
+    if not app.static_folder or not os.path.isdir(app.static_folder):
+        return
+    target_root = os.path.join(out_dir, app.static_url_path.strip('/'))
+    for root, _, files in os.walk(app.static_folder):
+        for name in files:
+            src = os.path.join(root, name)
+            dst = os.path.join(target_root, os.path.relpath(src, app.static_folder))
+            st = os.stat(src)
+            if os.path.exists(dst) and os.stat(dst).st_mtime_ns == st.st_mtime_ns \
+                    and os.path.getsize(dst) == st.st_size:
+                continue
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if name.endswith(_COMPRESSIBLE_SUFFIXES):
+                with open(src, 'rb') as f:
+                    _replace(dst + '.gz', gzip.compress(f.read(), compresslevel=9, mtime=0))
+            shutil.copy2(src, dst)
+
+
+def _load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'pages': {}}
+
+
+def _save_manifest(out_dir: str, manifest: dict) -> None:
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    _write(out_dir, MANIFEST_NAME, data, compress=False)
+
+
+def export_site(app: Flask, out_dir: Optional[str] = None, force: bool = False,
+                endpoints: Optional[Iterable[str]] = None) -> List[str]:
+    """Render pages into `out_dir`; returns the URLs that were (re)written.
+
+    Pages are skipped when their templates are unchanged and, for
+    DB_ENDPOINTS, the project data generation is the same as last time.
+    Previously exported pages that now fail, are no longer HTML or whose
+    route is gone are removed along with their manifest entries.
+    The database must already be initialised (the CLI command does this).
+    `endpoints` limits the run to those endpoints; `force` re-renders all.
+    """
+    out_dir = out_dir or app.config['EXPORT_DIR']
+    os.makedirs(out_dir, exist_ok=True)
+    with _export_lock(out_dir):
+        return _export_locked(app, out_dir, force, endpoints)
+
+
+def _export_locked(app: Flask, out_dir: str, force: bool,
+                   endpoints: Optional[Iterable[str]]) -> List[str]:
+    manifest = _load_manifest(out_dir)
+    wanted = set(endpoints) if endpoints is not None else None
+
+    generation = DAL.get_generation()
+    client = app.test_client()
+    written = []
+    pages = _static_pages(app)
+
+    if wanted is None:
+        # Routes that were exported before but no longer exist.
+        current = {url for url, _ in pages}
+        for url in [url for url in manifest['pages'] if url not in current]:
+            _remove_page(out_dir, manifest, url)
+
+    for url, endpoint in pages:
+        if wanted is not None and endpoint not in wanted:
+            continue
+        page_generation = generation if endpoint in DB_ENDPOINTS else None
+        entry = manifest['pages'].get(url)
+        # A page rendered without templates has nothing to compare, so it is
+        # always fetched again.
+        if (not force and entry and entry['templates'] and entry['generation'] == page_generation
+                and os.path.exists(os.path.join(out_dir, entry['file']))
+                and _templates_unchanged(app, entry['templates'])):
+            continue
+
+        rendered = []
+
+        def record(sender, template, context, **extra):
+            rendered.append(template.name)
+
+        with template_rendered.connected_to(record, app):
+            response = client.get(url)
+        if response.status_code != 200 or response.mimetype != 'text/html':
+            # Redirects and session-only pages cannot be served statically, and
+            # non-HTML routes such as /download-resume have no templates to
+            # track. Drop any copy from an earlier run rather than serve it stale.
+            if url in manifest['pages']:
+                _remove_page(out_dir, manifest, url)
+            continue
+
+        rel_path = _output_path(url)
+        _write(out_dir, rel_path, response.get_data(), compress=True)
+        manifest['pages'][url] = {
+            'file': rel_path,
+            'generation': page_generation,
+            'templates': _template_hashes(app, rendered),
+        }
+        written.append(url)
+
+    if wanted is None:
+        _copy_static(app, out_dir)
+    _save_manifest(out_dir, manifest)
+    return written
+
+
+# The app whose /projects is re-exported after DAL writes. Held weakly and
+# registered as a single DAL hook, so building more apps never stacks hooks.
+_export_app: Optional['weakref.ref[Flask]'] = None
+
+
+def _export_after_write() -> None:
+    app = _export_app() if _export_app is not None else None
+    if app is not None:
+        export_site(app, endpoints=DB_ENDPOINTS)
+
+
+def enable_export_on_write(app: Flask) -> None:
+    """Re-export `app`'s project pages after every DAL write in this process."""
+    global _export_app
+    _export_app = weakref.ref(app)
+    DAL.add_write_hook(_export_after_write)
+
+
+def disable_export_on_write() -> None:
+    global _export_app
+    _export_app = None
+    DAL.remove_write_hook(_export_after_write)
+
+
+@click.command('export')
+@click.argument('out_dir', required=False)
+@click.option('--force', is_flag=True, help="Re-render every page even if unchanged.")
+@with_appcontext
+def export_command(out_dir: Optional[str], force: bool) -> None:
+    """Render the site to static files for a plain file server."""
+    out_dir = out_dir or current_app.config['EXPORT_DIR']
+    DAL.init_db()
+    written = export_site(current_app._get_current_object(), out_dir, force=force)
+    click.echo(f"Exported {len(written)} page(s) to {out_dir}")
+    for url in written:
+        click.echo(f"  {url}")
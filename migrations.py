@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Schema migrations for projects.db.
+
+The schema version lives in SQLite's ``PRAGMA user_version``. Each migration
+bumps it by one inside the same transaction as its changes, so a crash leaves
+the database at the last fully applied version. Every transaction takes the
+write lock up front and re-reads the version, so several processes can
+migrate the same database at once: the first applies a step, the rest wait
+and then skip it.
+
+Usage:
+    python migrations.py            # report version and pending steps (exit 1 if any)
+    python migrations.py upgrade    # apply pending steps
+"""
+
+import argparse
+import sqlite3
+import sys
+from typing import Callable, List, Optional, Sequence
+
+
+def _in_transaction(conn: sqlite3.Connection, func):
+    # IMMEDIATE waits for the write lock (up to the connection timeout). A
+    # deferred BEGIN would read first and then fail with "database is locked"
+    # when another migrating process wrote in between.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        result = func(conn)
+        conn.commit()
+        return result
+    except BaseException:  # includes KeyboardInterrupt, so a killed run leaves no open transaction
+        conn.rollback()
+        raise
+
+
+def _set_version(conn: sqlite3.Connection, version: int) -> None:
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+class Migration:
+    """A schema change applied in a single transaction."""
+
+    def __init__(self, version: int, description: str,
+                 apply: Callable[[sqlite3.Connection], None]):
+        self.version = version
+        self.description = description
+        self.apply = apply
+
+    def run(self, conn: sqlite3.Connection, batch_size: int) -> bool:
+        """Apply this step unless another connection already has; returns True if applied."""
+        def step(c: sqlite3.Connection) -> bool:
+            if get_version(c) >= self.version:
+                return False
+            self.apply(c)
+            _set_version(c, self.version)
+            return True
+
+        return _in_transaction(conn, step)
+
+
+class ChunkedMigration(Migration):
+    """A long-running change (e.g. a backfill) committed in small batches.
+
+    ``setup`` runs in its own transaction first. ``chunk(conn, batch_size)`` is
+    then called repeatedly, each call in its own short transaction, until it
+    returns 0. The version is only bumped after the last chunk, so a rerun
+    after an interruption calls ``setup`` again: it must be idempotent (e.g.
+    check ``PRAGMA table_info`` before ``ADD COLUMN``). Chunks must only touch
+    rows that still need work so the rerun resumes where it stopped.
+    """
+
+    def __init__(self, version: int, description: str,
+                 chunk: Callable[[sqlite3.Connection, int], int],
+                 setup: Optional[Callable[[sqlite3.Connection], None]] = None):
+        super().__init__(version, description, setup or (lambda conn: None))
+        self.chunk = chunk
+
+    def run(self, conn: sqlite3.Connection, batch_size: int) -> bool:
+        # Every transaction re-checks the version, so if another process
+        # finishes this migration first the remaining ones do nothing.
+        def setup(c: sqlite3.Connection) -> bool:
+            if get_version(c) >= self.version:
+                return False
+            self.apply(c)
+            return True
+
+        def chunk(c: sqlite3.Connection) -> int:
+            if get_version(c) >= self.version:
+                return 0
+            return self.chunk(c, batch_size)
+
+        def finish(c: sqlite3.Connection) -> bool:
+            if get_version(c) >= self.version:
+                return False
+            _set_version(c, self.version)
+            return True
+
+        if not _in_transaction(conn, setup):
+            return False
+        while _in_transaction(conn, chunk):
+            pass
+        return _in_transaction(conn, finish)
+
+
+def _create_projects(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            image_file_name TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _add_soft_delete(conn: sqlite3.Connection) -> None:
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(projects)")]
+    if 'deleted_at' not in columns:
+        conn.execute("ALTER TABLE projects ADD COLUMN deleted_at DATETIME DEFAULT NULL")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_projects_live "
+        "ON projects (created_at DESC) WHERE deleted_at IS NULL"
+    )
+
+
+def _add_generation_counter(conn: sqlite3.Connection) -> None:
+    # Bumped by triggers on every change to live rows, so caches and static
+    # exports can tell whether listings changed without comparing content.
+    # Purging an already tombstoned row does not count as a change.
+    conn.execute("CREATE TABLE IF NOT EXISTS dal_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    conn.execute("INSERT OR IGNORE INTO dal_meta (key, value) VALUES ('generation', 0)")
+    bump = "UPDATE dal_meta SET value = value + 1 WHERE key = 'generation';"
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS projects_generation_insert "
+                 f"AFTER INSERT ON projects BEGIN {bump} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS projects_generation_update "
+                 f"AFTER UPDATE ON projects BEGIN {bump} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS projects_generation_delete "
+                 f"AFTER DELETE ON projects WHEN OLD.deleted_at IS NULL BEGIN {bump} END")
+
+
+def _index_live_rows_by_id(conn: sqlite3.Connection) -> None:
+    # list_projects breaks created_at ties by id; without id in the index
+    # SQLite sorts each run of equal timestamps in a temp b-tree.
+    conn.execute("DROP INDEX IF EXISTS idx_projects_live")
+    conn.execute(
+        "CREATE INDEX idx_projects_live "
+        "ON projects (created_at DESC, id DESC) WHERE deleted_at IS NULL"
+    )
+
+
+# Ordered list of every migration. Append new steps with the next version
+# number; never edit or reorder a step that has shipped. Databases created
+# before versioning report user_version 0, so early steps are idempotent.
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'create projects table', _create_projects),
+    Migration(2, 'add deleted_at tombstone and live-rows index', _add_soft_delete),
+    Migration(3, 'add data generation counter', _add_generation_counter),
+    Migration(4, 'order live-rows index by id as well', _index_live_rows_by_id),
+]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn: sqlite3.Connection,
+                       migrations: Sequence[Migration] = MIGRATIONS) -> List[Migration]:
+    current = get_version(conn)
+    return [m for m in sorted(migrations, key=lambda m: m.version) if m.version > current]
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS,
+            batch_size: int = 1000) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    if conn.in_transaction:
+        conn.commit()
+    applied = []
+    for migration in pending_migrations(conn, migrations):
+        if migration.run(conn, batch_size):
+            applied.append(migration.version)
+    return applied
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage projects.db schema migrations")
+    parser.add_argument('command', nargs='?', choices=['status', 'upgrade'], default='status')
+    parser.add_argument('--db', help="database path (defaults to the app's projects.db)")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="rows per transaction for chunked migrations")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db_path = args.db
+    else:
+        from DAL import get_db_path
+        db_path = get_db_path()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if args.command == 'upgrade':
+            applied = migrate(conn, batch_size=args.batch_size)
+            print(f"Applied {len(applied)} migration(s); now at version {get_version(conn)}")
+            return 0
+
+        pending = pending_migrations(conn)
+        print(f"{db_path}: schema version {get_version(conn)}")
+        if not pending:
+            print("No pending migrations")
+            return 0
+        print(f"{len(pending)} pending migration(s):")
+        for migration in pending:
+            print(f"  {migration.version:>4}  {migration.description}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
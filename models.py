@@ -0,0 +1,46 @@
+from typing import Any, Sequence
+
+
+class Project:
+    """Compact record for a listed project.
+
+    Uses ``__slots__`` instead of a per-row dict or ``sqlite3.Row``, so large
+    listings cost less memory and templates read fields as plain attributes.
+    String indexing (``project['title']``) still works for older callers.
+    """
+
+    __slots__ = ('id', 'title', 'description', 'image_file_name', 'created_at')
+
+    def __init__(self, id: int, title: str, description: str, image_file_name: str, created_at: Any):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.image_file_name = image_file_name
+        self.created_at = created_at
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def _astuple(self) -> tuple:
+        return (self.id, self.title, self.description, self.image_file_name, self.created_at)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Project):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        return f"Project(id={self.id!r}, title={self.title!r})"
+
+
+def project_row_factory(cursor: Any, row: Sequence[Any]) -> Project:
+    """sqlite3 row factory for queries selecting the Project columns in order."""
+    return Project(*row)
@@ -0,0 +1,144 @@
+"""
+Immutable, memory-mapped snapshot of the live projects table.
+
+The writer serialises every live row into one file; worker processes mmap it
+and read projects without opening SQLite. The file is replaced atomically on
+each publish, so a reader keeps a consistent view until it notices the new
+file and remaps.
+
+Layout (native byte order; snapshots are only shared between processes on
+one host):
+    header   magic b'PRJS', format version (u16), field count (u16),
+             generation (u64), row count (u32), 4 bytes padding
+    ids      row count x i64
+    offsets  (row count x field count + 1) x u32 byte offsets into the blob
+    nulls    row count x field count bytes, 1 where the field is NULL
+    blob     UTF-8 text of every field, back to back
+"""
+
+import collections.abc
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from models import Project
+
+MAGIC = b'PRJS'
+FORMAT_VERSION = 2
+FIELDS = ('title', 'description', 'image_file_name', 'created_at')
+
+_HEADER = struct.Struct('=4sHHQI4x')
+
+# path -> (inode, mtime_ns, snapshot) for the file each process has mapped
+_open_snapshots: Dict[str, Tuple[int, int, 'ProjectSnapshot']] = {}
+
+
+def write_snapshot(path: str, rows: Iterable[Sequence[Any]], generation: int = 0) -> str:
+    """Serialise `rows` of (id, title, description, image_file_name, created_at) to `path`."""
+    ids = []
+    offsets = [0]
+    nulls = bytearray()
+    blob = bytearray()
+    for row in rows:
+        ids.append(int(row[0]))
+        for value in row[1:1 + len(FIELDS)]:
+            nulls.append(value is None)
+            if value is not None:
+                blob += str(value).encode('utf-8')
+            offsets.append(len(blob))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(FIELDS), generation, len(ids)))
+            f.write(struct.pack(f'={len(ids)}q', *ids))
+            f.write(struct.pack(f'={len(offsets)}I', *offsets))
+            f.write(nulls)
+            f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+class ProjectSnapshot(collections.abc.Sequence):
+    """Read-only sequence view over a mapped snapshot file.
+
+    Indexing decodes a single row; slicing returns a list of Projects.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # Also keeps mmap from failing on an empty file.
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is too short to be a projects snapshot")
+            self._mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        magic, version, field_count, self.generation, count = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != FORMAT_VERSION or field_count != len(FIELDS):
+            raise ValueError(f"{path} is not a projects snapshot")
+
+        view = memoryview(self._mm)
+        ids_start = _HEADER.size
+        offsets_start = ids_start + count * 8
+        nulls_start = offsets_start + (count * field_count + 1) * 4
+        blob_start = nulls_start + count * field_count
+        if size < blob_start:
+            raise ValueError(f"{path} is a truncated projects snapshot")
+        self._count = count
+        self._ids = view[ids_start:offsets_start].cast('q')
+        self._offsets = view[offsets_start:nulls_start].cast('I')
+        self._nulls = view[nulls_start:blob_start]
+        self._blob = view[blob_start:]
+        if self._offsets[-1] != len(self._blob):
+            raise ValueError(f"{path} is a truncated projects snapshot")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _field(self, slot: int) -> Optional[str]:
+        if self._nulls[slot]:
+            return None
+        return str(self._blob[self._offsets[slot]:self._offsets[slot + 1]], 'utf-8')
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Project, List[Project]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('snapshot index out of range')
+        base = index * len(FIELDS)
+        return Project(self._ids[index], *(self._field(base + i) for i in range(len(FIELDS))))
+
+    def __iter__(self) -> Iterator[Project]:
+        for index in range(self._count):
+            yield self[index]
+
+
+def load_snapshot(path: str) -> Optional[ProjectSnapshot]:
+    """Return the mapped snapshot at `path`, remapping if it was republished.
+
+    Returns None if the file is missing, truncated or not a snapshot (e.g. one
+    from an older format version), so the caller can publish a fresh one.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _open_snapshots.pop(path, None)
+        return None
+    cached = _open_snapshots.get(path)
+    if cached and cached[0] == st.st_ino and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    try:
+        snapshot = ProjectSnapshot(path)
+    except (ValueError, OSError):
+        _open_snapshots.pop(path, None)
+        return None
+    _open_snapshots[path] = (st.st_ino, st.st_mtime_ns, snapshot)
+    return snapshot
@@ -30,7 +30,12 @@ def run_tests():
     # Run tests with verbose output
     test_files = [
         str(script_dir / "test_dal.py"),
-        str(script_dir / "test_app.py")
+        str(script_dir / "test_app.py"),
+        str(script_dir / "test_migrations.py"),
+        str(script_dir / "test_backup.py"),
+        str(script_dir / "test_project_snapshot.py"),
+        str(script_dir / "test_export.py"),
+        str(script_dir / "test_startup_report.py")
     ]
     
     # Check if test files exist
@@ -81,7 +86,7 @@ def run_coverage():
     # Run tests with coverage
     cmd = [
         sys.executable, "-m", "coverage", "run", "-m", "pytest",
-        "test_dal.py", "test_app.py", "-v"
+        "test_dal.py", "test_app.py", "test_migrations.py", "test_backup.py", "test_project_snapshot.py", "test_export.py", "test_startup_report.py", "-v"
     ]
     
     try:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Cold-start report for a worker process.
+
+Runs a fresh interpreter with ``python -X importtime``, imports the app and
+calls ``create_app()``, then prints the slowest imports and checks the total
+against a budget. Exits 1 when the budget is exceeded so it can run in CI.
+
+Usage:
+    python startup_report.py [--budget-ms N] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+
+# Target wall time for a fresh interpreter to start, import the app and build
+# it with create_app(), measured around the whole subprocess. Importing Flask
+# accounts for most of it; keep project imports well under that.
+COLD_START_BUDGET_MS = 400
+
+_STARTUP_SNIPPET = "import app; app.create_app()"
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse `-X importtime` output into (module, depth, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(parts[0]), int(parts[1])))
+    return rows
+
+
+def measure_startup(cwd: Optional[str] = None) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """Return (wall-clock ms from process start to a ready app, import rows)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _STARTUP_SNIPPET],
+        cwd=cwd or Path(__file__).parent, capture_output=True, text=True, check=True,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report worker cold-start import time")
+    parser.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args(argv)
+
+    total_ms, rows = measure_startup()
+    # Depth 0 is `app` itself plus interpreter bootstrap; depth 1 is what app imports.
+    top_level = [row for row in rows if row[1] <= 1]
+
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for name, _, self_us, cumulative_us in sorted(top_level, key=lambda r: r[3], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name}")
+    print("-" * 40)
+    print(f"Cold start: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if total_ms > args.budget_ms:
+        print("Over budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
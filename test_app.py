@@ -3,7 +3,7 @@ import os
 import tempfile
 import json
 from unittest.mock import patch, MagicMock
-from app import app
+from app import app, create_app, start_background_jobs
 from DAL import init_db
 
 
@@ -36,7 +36,10 @@ class TestFlaskApp:
         """Clean up after each test"""
         self.db_path_patcher.stop()
         os.close(self.test_db_fd)
-        os.unlink(self.test_db_path)
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db_path + suffix):
+                os.unlink(self.test_db_path + suffix)
         
         # Clean up test uploads directory
         import shutil
@@ -77,6 +80,21 @@ class TestFlaskApp:
         assert b'Test Project' in response.data
         assert b'Test Description' in response.data
     
+    def test_projects_route_from_snapshot(self):
+        """Test rendering /projects from the mapped snapshot"""
+        from DAL import insert_project, set_snapshot_path
+        snapshot_path = os.path.join(self.test_uploads_dir, 'projects.snapshot')
+        set_snapshot_path(snapshot_path)
+        try:
+            insert_project("Snapshot Project", "Snapshot Description", "test.jpg")
+            self.client.get('/')  # first request initialises the database
+            with patch('DAL.get_connection', side_effect=AssertionError("database touched")):
+                response = self.client.get('/projects')
+        finally:
+            set_snapshot_path(None)
+        assert response.status_code == 200
+        assert b'Snapshot Project' in response.data
+    
     def test_add_project_get(self):
         """Test GET request to add project form"""
         response = self.client.get('/projects/add')
@@ -155,6 +173,25 @@ class TestFlaskApp:
         assert response.status_code == 200
         assert b'Project not found' in response.data
     
+    def test_delete_projects_batch(self):
+        """Test deleting several projects in one request"""
+        from DAL import insert_project, list_projects
+        id1 = insert_project("Project 1", "Description 1", "image1.jpg")
+        id2 = insert_project("Project 2", "Description 2", "image2.jpg")
+        id3 = insert_project("Project 3", "Description 3", "image3.jpg")
+        
+        response = self.client.post('/projects/delete', data={'project_ids': [str(id1), str(id3)]},
+                                    follow_redirects=True)
+        assert response.status_code == 200
+        assert b'2 project(s) deleted' in response.data
+        assert [p['id'] for p in list_projects()] == [id2]
+    
+    def test_delete_projects_batch_none_selected(self):
+        """Test batch delete without any selection"""
+        response = self.client.post('/projects/delete', follow_redirects=True)
+        assert response.status_code == 200
+        assert b'No projects selected' in response.data
+    
     def test_contact_get(self):
         """Test GET request to contact form"""
         response = self.client.get('/contact')
@@ -318,6 +355,48 @@ class TestFlaskApp:
             assert response.status_code == 200
             mock_send_file.assert_called_once_with('Zein_George_Resume.pdf', as_attachment=True)
     
+    def test_create_app_applies_config(self):
+        """Test that the factory merges config over the defaults"""
+        new_app = create_app({'MAX_CONTENT_LENGTH': 1024, 'UPLOAD_FOLDER': self.test_uploads_dir})
+        assert new_app is not app
+        assert new_app.config['MAX_CONTENT_LENGTH'] == 1024
+        assert os.path.isabs(create_app().config['UPLOAD_FOLDER'])
+    
+    def test_create_app_resets_dal_routing(self):
+        """Test that a new app does not inherit an earlier app's replica or snapshot"""
+        import DAL
+        create_app({'READ_REPLICA_PATH': '/tmp/replica.db', 'PROJECTS_SNAPSHOT_PATH': '/tmp/projects.snapshot'})
+        assert DAL._read_replica_path == '/tmp/replica.db'
+        assert DAL._snapshot_path == '/tmp/projects.snapshot'
+        
+        create_app()
+        assert DAL._read_replica_path is None
+        assert DAL._snapshot_path is None
+    
+    def test_create_app_initialises_db_lazily(self):
+        """Test that the database is only created on the first request"""
+        upload_dir = os.path.join(self.test_uploads_dir, 'lazy')
+        with patch('app.init_db') as mock_init_db:
+            new_app = create_app({'TESTING': True, 'UPLOAD_FOLDER': upload_dir})
+            mock_init_db.assert_not_called()
+            assert not os.path.exists(upload_dir)
+            
+            client = new_app.test_client()
+            client.get('/')
+            client.get('/about')
+            mock_init_db.assert_called_once()
+            assert os.path.isdir(upload_dir)
+    
+    def test_start_background_jobs_once(self):
+        """Test that maintenance threads start once per app"""
+        new_app = create_app({'TESTING': True})
+        with patch('compactor.Compactor') as mock_compactor, \
+                patch('backup.BackupScheduler') as mock_scheduler:
+            jobs = start_background_jobs(new_app)
+            assert start_background_jobs(new_app) is jobs
+        mock_compactor.return_value.start.assert_called_once()
+        mock_scheduler.return_value.start.assert_called_once()
+    
     def test_404_error_handler(self):
         """Test 404 error handler"""
         response = self.client.get('/nonexistent-page')
@@ -0,0 +1,167 @@
+import pytest
+import os
+import tempfile
+import shutil
+import time
+import sqlite3
+from unittest.mock import patch
+import DAL
+from DAL import init_db, list_projects, insert_project, set_read_replica
+from backup import (
+    BackupScheduler, backup_database, take_snapshot, list_snapshots, prune_snapshots, refresh_replica, main,
+)
+
+
+class TestBackup:
+    """Test cases for online backups and the read replica"""
+
+    def setup_method(self):
+        """Set up a test database and backup directory before each test"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        self.backup_dir = tempfile.mkdtemp()
+
+        self.db_path_patcher = patch('DAL.get_db_path')
+        self.mock_db_path = self.db_path_patcher.start()
+        self.mock_db_path.return_value = self.test_db_path
+
+        init_db()
+
+    def teardown_method(self):
+        """Clean up after each test"""
+        set_read_replica(None)
+        self.db_path_patcher.stop()
+        os.close(self.test_db_fd)
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db_path + suffix):
+                os.unlink(self.test_db_path + suffix)
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+    def test_backup_database_copies_rows(self):
+        """Test that a backup contains the live rows"""
+        insert_project("Test Project", "Test Description", "test.jpg")
+        dest = os.path.join(self.backup_dir, 'copy.db')
+
+        assert backup_database(dest, pages=1) == dest
+        assert os.listdir(self.backup_dir) == ['copy.db']
+
+        conn = sqlite3.connect(dest)
+        try:
+            assert conn.execute("SELECT title FROM projects").fetchall() == [("Test Project",)]
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        finally:
+            conn.close()
+
+    def test_backup_database_sleeps_between_steps(self):
+        """Test that the copy pauses between page steps, not only when busy"""
+        for i in range(20):
+            insert_project(f"Project {i}", "x" * 2000, "image.jpg")
+        with DAL.get_connection() as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+
+        with patch('backup.time.sleep') as mock_sleep:
+            backup_database(os.path.join(self.backup_dir, 'copy.db'), pages=4, sleep=0.25)
+
+        steps = -(-page_count // 4)
+        assert mock_sleep.call_count == steps - 1
+        assert all(call.args == (0.25,) for call in mock_sleep.call_args_list)
+
+    def test_take_snapshot_applies_retention(self):
+        """Test that only the newest snapshots are kept"""
+        paths = [take_snapshot(self.backup_dir, keep=2) for _ in range(4)]
+
+        assert list_snapshots(self.backup_dir) == paths[-2:]
+
+    def test_prune_snapshots_ignores_other_files(self):
+        """Test that retention leaves unrelated files alone"""
+        other = os.path.join(self.backup_dir, 'notes.txt')
+        open(other, 'w').close()
+        take_snapshot(self.backup_dir, keep=5)
+        newest = take_snapshot(self.backup_dir, keep=5)
+
+        assert len(prune_snapshots(self.backup_dir, keep=1)) == 1
+        assert sorted(os.listdir(self.backup_dir)) == sorted(['notes.txt', os.path.basename(newest)])
+
+    def test_keep_must_be_positive(self):
+        """Test that retention never deletes the snapshot just taken"""
+        with pytest.raises(ValueError):
+            take_snapshot(self.backup_dir, keep=0)
+        with pytest.raises(ValueError):
+            prune_snapshots(self.backup_dir, keep=0)
+        with pytest.raises(SystemExit):
+            main([self.backup_dir, '--keep', '0'])
+        assert list_snapshots(self.backup_dir) == []
+
+    def test_list_projects_reads_from_replica(self):
+        """Test that listing uses the replica once configured"""
+        insert_project("Replicated", "Description", "a.jpg")
+        replica = refresh_replica(os.path.join(self.backup_dir, 'replica.db'))
+
+        # A write made outside the DAL only shows up after the next refresh
+        conn = sqlite3.connect(self.test_db_path)
+        with conn:
+            conn.execute(
+                "INSERT INTO projects (title, description, image_file_name) VALUES ('External', 'd', 'b.jpg')"
+            )
+        conn.close()
+
+        set_read_replica(replica)
+        assert [p['title'] for p in list_projects()] == ["Replicated"]
+
+        refresh_replica(replica)
+        assert len(list_projects()) == 2
+
+    def test_dal_writes_do_not_copy_replica(self):
+        """Test that writes leave the replica to the scheduler instead of copying inline"""
+        replica = refresh_replica(os.path.join(self.backup_dir, 'replica.db'))
+        set_read_replica(replica)
+
+        with patch('backup.backup_database') as mock_backup:
+            insert_project("Fresh", "Description", "a.jpg")
+        mock_backup.assert_not_called()
+        assert list_projects() == []
+
+    def test_scheduler_refreshes_replica_only_after_writes(self):
+        """Test that the replica is copied again only once the data changed"""
+        replica = os.path.join(self.backup_dir, 'replica.db')
+        set_read_replica(replica)
+        scheduler = BackupScheduler(self.backup_dir, replica_path=replica)
+
+        assert scheduler.refresh_replica_if_changed() is True
+        assert scheduler.refresh_replica_if_changed() is False
+
+        insert_project("Fresh", "Description", "a.jpg")
+        assert scheduler.refresh_replica_if_changed() is True
+        assert [p['title'] for p in list_projects()] == ["Fresh"]
+
+    def test_scheduler_refreshes_replica_at_start(self):
+        """Test that the scheduler refreshes the replica before its first interval"""
+        replica = os.path.join(self.backup_dir, 'replica.db')
+        scheduler = BackupScheduler(self.backup_dir, interval=3600, replica_path=replica)
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(replica):
+                    break
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+            scheduler.join()
+
+        assert os.path.exists(replica)
+        assert list_snapshots(self.backup_dir) == []
+
+    def test_replica_is_read_only(self):
+        """Test that replica connections cannot write"""
+        replica = refresh_replica(os.path.join(self.backup_dir, 'replica.db'))
+        set_read_replica(replica)
+
+        with pytest.raises(sqlite3.OperationalError):
+            DAL.get_read_connection().execute("DELETE FROM projects")
+
+    def test_missing_replica_falls_back_to_primary(self):
+        """Test that a configured but absent replica is ignored"""
+        insert_project("Test Project", "Test Description", "test.jpg")
+        set_read_replica(os.path.join(self.backup_dir, 'missing.db'))
+
+        assert len(list_projects()) == 1
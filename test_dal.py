@@ -3,7 +3,12 @@ import os
 import tempfile
 import sqlite3
 from unittest.mock import patch, MagicMock
-from DAL import init_db, list_projects, insert_project, delete_project, get_connection, get_db_path
+from DAL import (
+    init_db, list_projects, insert_project, delete_project, delete_projects,
+    purge_deleted_projects, compact_db, enable_incremental_vacuum, get_connection, get_db_path,
+)
+from compactor import Compactor
+from models import Project
 
 
 class TestDAL:
@@ -26,7 +31,10 @@ class TestDAL:
         """Clean up after each test"""
         self.db_path_patcher.stop()
         os.close(self.test_db_fd)
-        os.unlink(self.test_db_path)
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db_path + suffix):
+                os.unlink(self.test_db_path + suffix)
     
     def test_init_db_creates_table(self):
         """Test that init_db creates the projects table"""
@@ -50,6 +58,14 @@ class TestDAL:
             for expected_col in expected_columns:
                 assert expected_col in column_names
     
+    def test_list_query_uses_index_for_ordering(self):
+        """Test that listing needs no extra sort step"""
+        from DAL import _LIST_SQL
+        with get_connection() as conn:
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _LIST_SQL)]
+        assert any('idx_projects_live' in step for step in plan)
+        assert not any('TEMP B-TREE' in step for step in plan)
+    
     def test_insert_project_success(self):
         """Test successful project insertion"""
         project_id = insert_project("Test Project", "Test Description", "test.jpg")
@@ -93,6 +109,20 @@ class TestDAL:
         assert projects[1]['title'] == "Project 2"
         assert projects[2]['title'] == "Project 1"
     
+    def test_list_projects_returns_project_records(self):
+        """Test that listings are slotted Project records"""
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+        
+        project = list_projects()[0]
+        assert isinstance(project, Project)
+        assert project.id == project_id
+        assert project.title == project['title'] == "Test Project"
+        assert project.image_file_name == "test.jpg"
+        assert not hasattr(project, '__dict__')
+        assert {project, list_projects()[0]} == {project}
+        with pytest.raises(KeyError):
+            project['missing']
+    
     def test_delete_project_success(self):
         """Test successful project deletion"""
         # Insert a project first
@@ -127,6 +157,109 @@ class TestDAL:
         assert len(projects) == 1
         assert projects[0]['id'] == project_id2
     
+    def test_delete_project_leaves_tombstone(self):
+        """Test that delete_project soft-deletes the row"""
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+        delete_project(project_id)
+        
+        with get_connection() as conn:
+            row = conn.execute("SELECT deleted_at FROM projects WHERE id = ?", (project_id,)).fetchone()
+        assert row is not None
+        assert row['deleted_at'] is not None
+        
+        # Deleting again is a no-op
+        assert delete_project(project_id) == 0
+    
+    def test_delete_projects_batch(self):
+        """Test deleting several projects in one call"""
+        ids = [insert_project(f"Project {i}", "Description", "image.jpg") for i in range(3)]
+        
+        deleted_count = delete_projects([ids[0], ids[2], 999])
+        assert deleted_count == 2
+        
+        projects = list_projects()
+        assert [p['id'] for p in projects] == [ids[1]]
+    
+    def test_delete_projects_empty(self):
+        """Test batch delete with no ids"""
+        assert delete_projects([]) == 0
+    
+    def test_purge_deleted_projects(self):
+        """Test purging tombstones removes only deleted rows"""
+        keep_id = insert_project("Keep", "Description", "keep.jpg")
+        drop_id = insert_project("Drop", "Description", "drop.jpg")
+        delete_project(drop_id)
+        
+        # Tombstone is too recent for a one hour TTL
+        assert purge_deleted_projects(3600) == 0
+        assert purge_deleted_projects(0) == 1
+        
+        with get_connection() as conn:
+            ids = [row['id'] for row in conn.execute("SELECT id FROM projects")]
+        assert ids == [keep_id]
+    
+    def test_compact_db(self):
+        """Test compaction reclaims free pages"""
+        ids = [insert_project(f"Project {i}", "x" * 2000, "image.jpg") for i in range(50)]
+        delete_projects(ids)
+        purge_deleted_projects(0)
+        
+        assert compact_db(max_pages=10000) == 0
+    
+    def test_compactor_converts_database_without_auto_vacuum(self):
+        """Test that a database created before auto-vacuum gets converted and compacted"""
+        # Databases that predate init_db's pragma, like the shipped projects.db
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute("PRAGMA auto_vacuum = NONE")
+        conn.execute("VACUUM")
+        conn.close()
+        init_db()
+        
+        ids = [insert_project(f"Project {i}", "x" * 2000, "image.jpg") for i in range(50)]
+        delete_projects(ids)
+        purge_deleted_projects(0)
+        with get_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+        assert compact_db(max_pages=10000) > 0  # nothing reclaimed yet
+        
+        Compactor(quiet_seconds=0).run_once()
+        
+        with get_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert enable_incremental_vacuum() is False
+        
+        ids = [insert_project(f"Project {i}", "x" * 2000, "image.jpg") for i in range(50)]
+        delete_projects(ids)
+        purge_deleted_projects(0)
+        assert compact_db(max_pages=10000) == 0
+    
+    def test_compactor_waits_for_quiet_period(self):
+        """Test compactor skips passes while writes are recent"""
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+        delete_project(project_id)
+        
+        assert Compactor(quiet_seconds=3600).run_once() is None
+        assert Compactor(quiet_seconds=0, tombstone_ttl=0).run_once() == 1
+    
+    def test_compactor_sees_writes_from_other_processes(self):
+        """Test that writes made outside this process reset the quiet period"""
+        compactor = Compactor(quiet_seconds=3600)
+        compactor.seconds_quiet()
+        compactor._last_change_at -= 7200  # pretend the database has been idle
+        assert compactor.seconds_quiet() >= 3600
+        
+        # A separate connection stands in for another worker process
+        other = sqlite3.connect(self.test_db_path)
+        with other:
+            other.execute(
+                "INSERT INTO projects (title, description, image_file_name) VALUES ('x', 'y', 'z.jpg')"
+            )
+        other.close()
+        
+        assert compactor.seconds_quiet() < 3600
+        assert compactor.run_once() is None
+    
     def test_get_connection_row_factory(self):
         """Test that get_connection returns connection with row factory"""
         conn = get_connection()
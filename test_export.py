@@ -0,0 +1,183 @@
+import pytest
+import os
+import gzip
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+import DAL
+from DAL import init_db, insert_project, get_generation
+from app import create_app
+import export
+from export import export_site, MANIFEST_NAME
+
+
+class TestExport:
+    """Test cases for the static site export"""
+
+    def setup_method(self):
+        """Set up a test database, app and output directory before each test"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        self.out_dir = tempfile.mkdtemp()
+
+        self.db_path_patcher = patch('DAL.get_db_path')
+        self.mock_db_path = self.db_path_patcher.start()
+        self.mock_db_path.return_value = self.test_db_path
+
+        init_db()
+        self.app = create_app({'TESTING': True, 'EXPORT_DIR': self.out_dir})
+
+    def teardown_method(self):
+        """Clean up after each test"""
+        export.disable_export_on_write()
+        self.db_path_patcher.stop()
+        os.close(self.test_db_fd)
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db_path + suffix):
+                os.unlink(self.test_db_path + suffix)
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.out_dir, rel_path), 'rb') as f:
+            return f.read()
+
+    def test_export_writes_pages_and_gzip(self):
+        """Test that every static route is written with a gzip copy"""
+        written = export_site(self.app)
+
+        assert {'/', '/about', '/resume', '/projects', '/contact'} <= set(written)
+        assert '/thank-you' not in written  # redirects without a session
+        assert '/download-resume' not in written  # not HTML
+        assert not os.path.exists(os.path.join(self.out_dir, 'download-resume'))
+        html = self.read('about/index.html')
+        assert b'<!DOCTYPE html>' in html
+        assert gzip.decompress(self.read('about/index.html.gz')) == html
+        assert self.read('index.html')
+        assert os.path.exists(os.path.join(self.out_dir, 'static', 'styles.css.gz'))
+
+    def test_export_is_incremental(self):
+        """Test that unchanged pages are skipped and DB pages follow the generation"""
+        export_site(self.app)
+        assert export_site(self.app) == []
+
+        insert_project("Exported Project", "Description", "test.jpg")
+        assert export_site(self.app) == ['/projects']
+        assert b'Exported Project' in self.read('projects/index.html')
+
+    def test_export_rerenders_changed_templates(self):
+        """Test that a page is re-rendered when one of its templates changes"""
+        export_site(self.app)
+        manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        assert 'base.html' in manifest['pages']['/about']['templates']
+
+        manifest['pages']['/about']['templates']['base.html'] = 'stale'
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        assert export_site(self.app) == ['/about']
+        assert len(export_site(self.app, force=True)) > 1
+
+    def test_export_removes_pages_that_are_no_longer_static(self):
+        """Test that pages which now redirect, stopped being HTML or lost their route are removed"""
+        export_site(self.app)
+        manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        # Entries as an earlier run might have left them
+        for url, rel_path in (('/thank-you', 'thank-you/index.html'),
+                              ('/download-resume', 'download-resume'),
+                              ('/old-page', 'old-page/index.html')):
+            os.makedirs(os.path.dirname(os.path.join(self.out_dir, rel_path)), exist_ok=True)
+            with open(os.path.join(self.out_dir, rel_path), 'wb') as f:
+                f.write(b'stale')
+            manifest['pages'][url] = {'file': rel_path, 'generation': None, 'templates': {}}
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        export_site(self.app)
+
+        with open(manifest_path) as f:
+            pages = json.load(f)['pages']
+        for url, rel_path in (('/thank-you', 'thank-you'),
+                              ('/download-resume', 'download-resume'),
+                              ('/old-page', 'old-page')):
+            assert url not in pages
+            assert not os.path.exists(os.path.join(self.out_dir, rel_path))
+        assert os.path.exists(os.path.join(self.out_dir, 'about', 'index.html'))
+
+    def test_generation_tracks_live_row_changes(self):
+        """Test that the generation counter moves on writes but not on purges"""
+        start = get_generation()
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+        DAL.delete_project(project_id)
+        assert get_generation() == start + 2
+
+        DAL.purge_deleted_projects(0)
+        assert get_generation() == start + 2
+
+    def test_export_cli(self):
+        """Test the flask export command"""
+        with patch('DAL.init_db') as mock_init_db:
+            result = self.app.test_cli_runner().invoke(args=['export', self.out_dir])
+        mock_init_db.assert_called_once()
+        assert result.exit_code == 0
+
+        result = self.app.test_cli_runner().invoke(args=['export', self.out_dir])
+
+        assert result.exit_code == 0
+        assert 'Exported' in result.output
+        assert os.path.exists(os.path.join(self.out_dir, 'projects', 'index.html'))
+
+    def test_export_on_write_hook(self):
+        """Test that DAL writes re-export the projects page when enabled"""
+        # Keep a reference: the export hook only holds the app weakly
+        app = create_app({'TESTING': True, 'EXPORT_DIR': self.out_dir, 'EXPORT_ON_WRITE': True})
+        insert_project("Hooked Project", "Description", "test.jpg")
+
+        assert b'Hooked Project' in self.read('projects/index.html')
+        assert not os.path.exists(os.path.join(self.out_dir, 'about'))
+        del app
+
+    def test_export_on_write_hook_registered_once(self):
+        """Test that building several apps leaves a single export hook"""
+        other_dir = tempfile.mkdtemp()
+        try:
+            first = create_app({'TESTING': True, 'EXPORT_DIR': other_dir, 'EXPORT_ON_WRITE': True})
+            second = create_app({'TESTING': True, 'EXPORT_DIR': self.out_dir, 'EXPORT_ON_WRITE': True})
+            assert DAL._write_hooks.count(export._export_after_write) == 1
+
+            insert_project("Hooked Project", "Description", "test.jpg")
+            assert os.path.exists(os.path.join(self.out_dir, 'projects', 'index.html'))
+            assert not os.path.exists(os.path.join(other_dir, 'projects'))
+            del first, second
+
+            create_app({'TESTING': True})
+            assert export._export_after_write not in DAL._write_hooks
+        finally:
+            shutil.rmtree(other_dir, ignore_errors=True)
+
+    def test_concurrent_exports(self):
+        """Test that parallel exports into one directory do not collide"""
+        import threading
+        insert_project("Test Project", "Test Description", "test.jpg")
+        errors = []
+
+        def run():
+            try:
+                export_site(self.app, force=True)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert not [name for name in os.listdir(self.out_dir) if name.startswith('.tmp-export-')]
+        with open(os.path.join(self.out_dir, MANIFEST_NAME)) as f:
+            assert '/projects' in json.load(f)['pages']
@@ -0,0 +1,163 @@
+import pytest
+import os
+import tempfile
+import sqlite3
+from migrations import (
+    Migration, ChunkedMigration, MIGRATIONS, get_version, pending_migrations, migrate, main,
+)
+
+
+class TestMigrations:
+    """Test cases for the schema migration runner"""
+
+    def setup_method(self):
+        """Open a fresh temporary database before each test"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        self.conn = sqlite3.connect(self.test_db_path)
+
+    def teardown_method(self):
+        """Clean up after each test"""
+        self.conn.close()
+        os.close(self.test_db_fd)
+        os.unlink(self.test_db_path)
+
+    def test_migrate_fresh_database(self):
+        """Test that all migrations apply to an empty database"""
+        applied = migrate(self.conn)
+
+        assert applied == [m.version for m in MIGRATIONS]
+        assert get_version(self.conn) == MIGRATIONS[-1].version
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(projects)")]
+        assert 'deleted_at' in columns
+
+    def test_migrate_is_idempotent(self):
+        """Test that a second run has nothing to do"""
+        migrate(self.conn)
+        assert pending_migrations(self.conn) == []
+        assert migrate(self.conn) == []
+
+    def test_migrate_unversioned_legacy_database(self):
+        """Test upgrading a database created before versioning existed"""
+        self.conn.execute(
+            "CREATE TABLE projects (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, "
+            "description TEXT NOT NULL, image_file_name TEXT NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self.conn.execute(
+            "INSERT INTO projects (title, description, image_file_name) VALUES ('a', 'b', 'c.jpg')"
+        )
+        self.conn.commit()
+
+        migrate(self.conn)
+
+        row = self.conn.execute("SELECT title, deleted_at FROM projects").fetchone()
+        assert row == ('a', None)
+
+    def test_failed_migration_rolls_back(self):
+        """Test that a failing step leaves the version and schema untouched"""
+        def broken(conn):
+            conn.execute("CREATE TABLE extra (x)")
+            raise RuntimeError("boom")
+
+        steps = MIGRATIONS + [Migration(len(MIGRATIONS) + 1, 'broken', broken)]
+        with pytest.raises(RuntimeError):
+            migrate(self.conn, steps)
+
+        assert get_version(self.conn) == MIGRATIONS[-1].version
+        assert self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'extra'"
+        ).fetchone() is None
+
+    def _slug_migration(self, batches, fail_after=None):
+        """Chunked migration adding and backfilling a slug column"""
+        def setup(conn):
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(projects)")]
+            if 'slug' not in columns:
+                conn.execute("ALTER TABLE projects ADD COLUMN slug TEXT")
+
+        def backfill(conn, batch_size):
+            if fail_after is not None and len(batches) == fail_after:
+                raise KeyboardInterrupt  # stands in for the process being killed
+            cur = conn.execute(
+                "UPDATE projects SET slug = lower(replace(title, ' ', '-')) WHERE id IN "
+                "(SELECT id FROM projects WHERE slug IS NULL LIMIT ?)",
+                (batch_size,),
+            )
+            batches.append(cur.rowcount)
+            return cur.rowcount
+
+        return ChunkedMigration(len(MIGRATIONS) + 1, 'backfill slug', backfill, setup)
+
+    def _insert_rows(self, count):
+        migrate(self.conn)
+        self.conn.executemany(
+            "INSERT INTO projects (title, description, image_file_name) VALUES (?, 'd', 'i.jpg')",
+            [(f"Project {i}",) for i in range(count)],
+        )
+        self.conn.commit()
+
+    def test_chunked_migration_runs_in_batches(self):
+        """Test that a chunked backfill commits batch by batch"""
+        self._insert_rows(25)
+        batches = []
+
+        migration = self._slug_migration(batches)
+        migrate(self.conn, MIGRATIONS + [migration], batch_size=10)
+
+        assert batches == [10, 10, 5, 0]
+        assert get_version(self.conn) == migration.version
+        assert self.conn.execute("SELECT COUNT(*) FROM projects WHERE slug IS NULL").fetchone()[0] == 0
+
+    def test_chunked_migration_resumes_after_interruption(self):
+        """Test that a rerun after an interrupted backfill picks up where it stopped"""
+        self._insert_rows(25)
+        batches = []
+
+        with pytest.raises(KeyboardInterrupt):
+            migrate(self.conn, MIGRATIONS + [self._slug_migration(batches, fail_after=2)], batch_size=10)
+        assert batches == [10, 10]
+        assert not self.conn.in_transaction
+        assert get_version(self.conn) == MIGRATIONS[-1].version
+        assert self.conn.execute("SELECT COUNT(*) FROM projects WHERE slug IS NULL").fetchone()[0] == 5
+
+        resumed = []
+        migration = self._slug_migration(resumed)
+        assert migrate(self.conn, MIGRATIONS + [migration], batch_size=10) == [migration.version]
+        assert resumed == [5, 0]
+        assert self.conn.execute("SELECT COUNT(*) FROM projects WHERE slug IS NULL").fetchone()[0] == 0
+
+    def test_concurrent_migrate_skips_applied_steps(self):
+        """Test that a connection with a stale pending list skips steps another one applied"""
+        other = sqlite3.connect(self.test_db_path)
+        try:
+            stale = pending_migrations(other)
+            assert migrate(self.conn) == [m.version for m in MIGRATIONS]
+
+            assert [m.run(other, 1000) for m in stale] == [False] * len(stale)
+            assert migrate(other) == []
+            assert get_version(other) == MIGRATIONS[-1].version
+        finally:
+            other.close()
+
+    def test_concurrent_chunked_migration_runs_once(self):
+        """Test that a chunked migration finished elsewhere is not rerun"""
+        self._insert_rows(5)
+        other = sqlite3.connect(self.test_db_path)
+        try:
+            migration = self._slug_migration([])
+            assert migrate(self.conn, MIGRATIONS + [migration]) == [migration.version]
+
+            batches = []
+            assert self._slug_migration(batches).run(other, 10) is False
+            assert batches == []
+        finally:
+            other.close()
+
+    def test_cli_reports_pending(self, capsys):
+        """Test the CLI status and upgrade commands"""
+        assert main(['--db', self.test_db_path]) == 1
+        assert 'pending migration' in capsys.readouterr().out
+
+        assert main(['upgrade', '--db', self.test_db_path]) == 0
+        assert main(['status', '--db', self.test_db_path]) == 0
+        assert 'No pending migrations' in capsys.readouterr().out
@@ -0,0 +1,181 @@
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import DAL
+from DAL import init_db, list_projects, insert_project, delete_project, set_snapshot_path
+from project_snapshot import write_snapshot, load_snapshot, ProjectSnapshot
+from models import Project
+
+
+class TestProjectSnapshot:
+    """Test cases for the memory-mapped project snapshot"""
+
+    def setup_method(self):
+        """Set up a test database and snapshot directory before each test"""
+        self.test_db_fd, self.test_db_path = tempfile.mkstemp()
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.snapshot_dir, 'projects.snapshot')
+
+        self.db_path_patcher = patch('DAL.get_db_path')
+        self.mock_db_path = self.db_path_patcher.start()
+        self.mock_db_path.return_value = self.test_db_path
+
+        init_db()
+
+    def teardown_method(self):
+        """Clean up after each test"""
+        set_snapshot_path(None)
+        self.db_path_patcher.stop()
+        os.close(self.test_db_fd)
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db_path + suffix):
+                os.unlink(self.test_db_path + suffix)
+        shutil.rmtree(self.snapshot_dir, ignore_errors=True)
+
+    def test_write_and_read_roundtrip(self):
+        """Test that rows survive a write/read cycle, including non-ASCII text"""
+        rows = [
+            (7, "Café ERP", "Automatisierung ✓", "cafe.jpg", "2025-01-02 03:04:05"),
+            (3, "Second", "", "second.jpg", None),
+        ]
+        write_snapshot(self.snapshot_path, rows, generation=42)
+
+        snapshot = ProjectSnapshot(self.snapshot_path)
+        assert len(snapshot) == 2
+        assert snapshot.generation == 42
+        assert snapshot[0] == Project(7, "Café ERP", "Automatisierung ✓", "cafe.jpg", "2025-01-02 03:04:05")
+        assert snapshot[-1]['created_at'] is None
+        assert snapshot[-1].description == ''
+        with pytest.raises(IndexError):
+            snapshot[2]
+
+    def test_snapshot_is_a_sequence(self):
+        """Test slicing and the other Sequence operations"""
+        rows = [(i, f"Project {i}", "d", "i.jpg", "") for i in range(5)]
+        write_snapshot(self.snapshot_path, rows)
+
+        snapshot = ProjectSnapshot(self.snapshot_path)
+        assert [p.id for p in snapshot[:2]] == [0, 1]
+        assert [p.id for p in snapshot[::-2]] == [4, 2, 0]
+        assert snapshot[10:] == []
+        assert [p.id for p in reversed(snapshot)] == [4, 3, 2, 1, 0]
+        assert Project(3, "Project 3", "d", "i.jpg", "") in snapshot
+        assert snapshot.index(Project(1, "Project 1", "d", "i.jpg", "")) == 1
+
+    def test_empty_snapshot(self):
+        """Test a snapshot with no rows"""
+        write_snapshot(self.snapshot_path, [])
+        assert list(ProjectSnapshot(self.snapshot_path)) == []
+
+    def test_rejects_foreign_file(self):
+        """Test that an unrelated file is not mistaken for a snapshot"""
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with pytest.raises(ValueError):
+            ProjectSnapshot(self.snapshot_path)
+
+    def test_rejects_truncated_file(self):
+        """Test that empty, short and cut-off files are rejected"""
+        write_snapshot(self.snapshot_path, [(1, "a", "b", "c.jpg", "")])
+        with open(self.snapshot_path, 'rb') as f:
+            data = f.read()
+
+        for length in (0, 10, len(data) - 1):
+            with open(self.snapshot_path, 'wb') as f:
+                f.write(data[:length])
+            with pytest.raises(ValueError):
+                ProjectSnapshot(self.snapshot_path)
+            assert load_snapshot(self.snapshot_path) is None
+
+    def test_list_projects_replaces_corrupt_snapshot(self):
+        """Test that a corrupt snapshot is republished instead of failing the read"""
+        set_snapshot_path(self.snapshot_path)
+        insert_project("Test Project", "Test Description", "test.jpg")
+
+        for data in (b'', b'PRJS'):
+            with open(self.snapshot_path, 'wb') as f:
+                f.write(data)
+            assert [p.title for p in list_projects()] == ["Test Project"]
+            assert load_snapshot(self.snapshot_path) is not None
+
+    def test_load_snapshot_remaps_after_publish(self):
+        """Test that readers pick up a republished file"""
+        assert load_snapshot(self.snapshot_path) is None
+
+        write_snapshot(self.snapshot_path, [(1, "a", "b", "c.jpg", "")])
+        first = load_snapshot(self.snapshot_path)
+        assert load_snapshot(self.snapshot_path) is first
+
+        write_snapshot(self.snapshot_path, [(1, "a", "b", "c.jpg", ""), (2, "d", "e", "f.jpg", "")])
+        assert len(load_snapshot(self.snapshot_path)) == 2
+        assert len(first) == 1
+
+    def test_writes_republish_snapshot(self):
+        """Test that DAL writes keep the snapshot current"""
+        set_snapshot_path(self.snapshot_path)
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+        assert [p['title'] for p in load_snapshot(self.snapshot_path)] == ["Test Project"]
+
+        delete_project(project_id)
+        assert len(load_snapshot(self.snapshot_path)) == 0
+
+    def test_list_projects_reads_snapshot_without_database(self):
+        """Test that listing is served from the snapshot alone"""
+        set_snapshot_path(self.snapshot_path)
+        insert_project("Test Project", "Test Description", "test.jpg")
+
+        with patch('DAL.get_connection', side_effect=AssertionError("database touched")):
+            projects = list_projects()
+            assert isinstance(projects, ProjectSnapshot)
+            assert len(projects) == 1
+            assert projects[0].title == "Test Project"
+
+    def test_snapshot_matches_database_listing(self):
+        """Test that snapshot mode returns the same rows as database mode, NULLs included"""
+        insert_project("First", "Description", "first.jpg")
+        insert_project("Second", "Description", "second.jpg")
+        with DAL.get_connection() as conn:
+            conn.execute("UPDATE projects SET created_at = NULL WHERE title = 'First'")
+        from_db = list(list_projects())
+
+        set_snapshot_path(self.snapshot_path)
+        DAL.publish_snapshot()
+        from_snapshot = list_projects()
+
+        assert list(from_snapshot) == from_db
+        assert from_snapshot[:1] == from_db[:1]
+
+    def test_failed_publish_does_not_fail_write(self):
+        """Test that a write succeeds even if the snapshot cannot be published"""
+        set_snapshot_path(os.path.join(self.snapshot_dir, 'missing', 'projects.snapshot'))
+
+        project_id = insert_project("Test Project", "Test Description", "test.jpg")
+
+        # Reads fall back to the database while the snapshot cannot be written
+        assert [p.id for p in list_projects()] == [project_id]
+
+    def test_failing_write_hook_does_not_fail_write(self):
+        """Test that a raising write hook is logged, not propagated"""
+        calls = []
+
+        def broken_hook():
+            raise RuntimeError("boom")
+
+        DAL.add_write_hook(broken_hook)
+        DAL.add_write_hook(lambda: calls.append(1))
+        try:
+            insert_project("Test Project", "Test Description", "test.jpg")
+        finally:
+            DAL._write_hooks.clear()
+        assert calls == [1]
+
+    def test_list_projects_publishes_missing_snapshot(self):
+        """Test that the first read publishes a snapshot if none exists"""
+        insert_project("Test Project", "Test Description", "test.jpg")
+        set_snapshot_path(self.snapshot_path)
+
+        assert [p['title'] for p in list_projects()] == ["Test Project"]
+        assert os.path.exists(self.snapshot_path)
@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import patch
+from startup_report import parse_importtime, main
+
+
+class TestStartupReport:
+    """Test cases for the cold-start report"""
+
+    def test_parse_importtime(self):
+        """Test parsing of python -X importtime output"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   werkzeug\n"
+            "import time:       500 |       2000 | flask\n"
+        )
+        assert parse_importtime(stderr) == [('werkzeug', 1, 120, 120), ('flask', 0, 500, 2000)]
+
+    def test_parse_importtime_ignores_other_output(self):
+        """Test that unrelated stderr lines are skipped"""
+        assert parse_importtime("Traceback (most recent call last):\n") == []
+
+    def test_main_checks_budget(self, capsys):
+        """Test that the report fails only when over budget"""
+        rows = [('app', 0, 5000, 250000), ('flask', 1, 700, 220000)]
+        with patch('startup_report.measure_startup', return_value=(300.0, rows)):
+            assert main(['--budget-ms', '400']) == 0
+            assert main(['--budget-ms', '200']) == 1
+        output = capsys.readouterr().out
+        assert 'flask' in output
+        assert 'Over budget' in output